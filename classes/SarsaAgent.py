@@ -1,12 +1,18 @@
 # SarsaAgent.py
 import numpy as np
 import random
+import time
 from collections import deque
 import matplotlib.pyplot as plt
 from multiprocessing import Pool
+from learning_plots import LearningPlotter, save_metrics
+from q_store import QStore
+from replay import PrioritizedReplayBuffer
 
 class SarsaAgent:
-    def __init__(self, conference, alpha=0.2, gamma=0.95, epsilon=0.3):
+    def __init__(self, conference, alpha=0.2, gamma=0.95, epsilon=0.3, run_store=None, seed=None,
+                 plotter=None, monitor=None, q_capacity=None, q_stale_years=None,
+                 replay_capacity=1000, prioritized_replay=False):
         """
         Advanced SARSA agent for collegiate swimming recruitment optimization.
         
@@ -15,15 +21,27 @@ class SarsaAgent:
             alpha: Initial learning rate (0.1-0.3 recommended)
             gamma: Discount factor (0.9-0.99 recommended)
             epsilon: Initial exploration rate (0.1-0.3 recommended)
+            run_store: Optional RunStore that persists every trained year
+            seed: Seed used for this run, recorded alongside the run config
+            plotter: Optional LearningPlotter re-rendered to file during training
+            monitor: Optional ConvergenceMonitor that stops training early
+            q_capacity: Maximum states kept in the Q-table (None for unbounded)
+            q_stale_years: Drop Q-table states untouched for this many years (None keeps them)
+            replay_capacity: Maximum transitions kept for experience replay
+            prioritized_replay: Sample replay batches by |TD error| instead of uniformly
         """
         self.conference = conference
         self.initial_alpha = alpha
         self.initial_epsilon = epsilon
         self.gamma = gamma
-        self.q_values = {}
         self.actions = [0, 10, 20, 30, 40, 50]  # Scholarship amounts in $10k
+        self.q_values = QStore(self.actions, capacity=q_capacity, stale_years=q_stale_years)
         # Experience replay
-        self.replay_buffer = deque(maxlen=1000)
+        self.prioritized_replay = prioritized_replay
+        if prioritized_replay:
+            self.replay_buffer = PrioritizedReplayBuffer(replay_capacity)
+        else:
+            self.replay_buffer = deque(maxlen=replay_capacity)
         self.batch_size = 32
         
         # Learning tracking
@@ -32,9 +50,22 @@ class SarsaAgent:
             'years': [],
             'scores': [],
             'budgets': {team.name: [] for team in conference.teams},
-            'rosters': {team.name: [] for team in conference.teams}
+            'rosters': {team.name: [] for team in conference.teams},
+            'convergence': [],     # Per-year ConvergenceMonitor signals
+            'stop_reason': None    # Why training ended before num_years, if it did
         }
 
+        # Persistent run storage
+        self.run_store = run_store
+        self.seed = seed
+        self.run_id = None
+        self.plotter = plotter
+
+        # Convergence tracking (Q-rows before their first update this year)
+        self.monitor = monitor
+        self.year_start_rows = {}
+        self.year_new_states = 0
+
     def get_state_key(self, team, swimmer):
         """Enhanced 9-dimensional state representation"""
         return (
@@ -105,10 +136,8 @@ class SarsaAgent:
             affordable = [a for a in self.actions if a <= team.budget]
             return random.choice(affordable) if affordable else 0
         
-        if state not in self.q_values:
-            self.q_values[state] = {a: 0 for a in self.actions}
-            
-        affordable_q = {a: q for a, q in self.q_values[state].items() 
+        # Read-only lookup so exploratory queries don't grow the Q-table
+        affordable_q = {a: q for a, q in self.q_values.get(state).items() 
                        if a <= team.budget}
         
         if not affordable_q:
@@ -129,28 +158,44 @@ class SarsaAgent:
         self.replay_buffer.append((state, action, reward, next_state, next_action))
         
         if len(self.replay_buffer) >= self.batch_size:
-            batch = random.sample(self.replay_buffer, self.batch_size)
+            if self.prioritized_replay:
+                leaves, batch, weights = self.replay_buffer.sample(self.batch_size)
+            else:
+                batch = random.sample(self.replay_buffer, self.batch_size)
+                weights = np.ones(self.batch_size)
             
-            for s, a, r, ns, na in batch:
-                if s not in self.q_values:
-                    self.q_values[s] = {act: 0 for act in self.actions}
-                if ns not in self.q_values:
-                    self.q_values[ns] = {act: 0 for act in self.actions}
+            td_errors = []
+            for (s, a, r, ns, na), weight in zip(batch, weights):
+                if self.q_values.is_new(s):
+                    self.year_new_states += 1
+                row = self.q_values.row(s)
+                if self.monitor is not None and s not in self.year_start_rows:
+                    self.year_start_rows[s] = dict(row)
                 
-                current_q = self.q_values[s][a]
-                next_q = self.q_values[ns][na]
+                current_q = row[a]
+                next_q = self.q_values.get(ns)[na]
                 td_target = r + self.gamma * next_q
-                self.q_values[s][a] += self.alpha * (td_target - current_q)
+                td_error = td_target - current_q
+                row[a] += self.alpha * weight * td_error  # Importance-sampling weighted
+                td_errors.append(td_error)
+            
+            if self.prioritized_replay:
+                self.replay_buffer.update_priorities(leaves, td_errors)
 
     def decay_parameters(self):
         """Gradual reduction of exploration/learning rates"""
         self.training_year += 1
+        self.q_values.advance_year(self.training_year)
         self.epsilon = self.initial_epsilon * (0.99 ** self.training_year)
         self.alpha = self.initial_alpha * (0.995 ** self.training_year)
 
     def train(self, num_years=10):
         """Enhanced training loop with end-of-year rewards"""
+        if self.run_store is not None and self.run_id is None:
+            self.run_id = self.run_store.start_run(self.get_run_config(num_years), self.seed)
+
         for year in range(num_years):
+            year_start = time.perf_counter()
             self.decay_parameters()
             
             # Store bids made this year to apply end-of-year rewards
@@ -193,9 +238,50 @@ class SarsaAgent:
                     next_action = self.choose_action(next_state, team, swimmer)
                     self.update_q_values(state, action, full_reward, next_state, next_action)
             
+            # Class years of the roster that competed, before graduation shifts them
+            if self.run_store is not None:
+                class_counts = self.run_store.class_counts(self.conference.teams)
+
             self.conference.advance_year()
             self.track_progress(year + 1, results)
+            if self.run_store is not None:
+                self.run_store.record_year(self.run_id, self.training_year, results,
+                                           self.run_store.team_rows(self.conference.teams, class_counts),
+                                           self.epsilon, self.alpha, len(self.q_values),
+                                           time.perf_counter() - year_start)
             self.print_progress(year + 1, results, num_years)
+            if self.plotter is not None:
+                self.plotter.update(self.learning_stats, self.training_year)
+            if self.monitor is not None:
+                signals = self.monitor.observe(self.training_year, self.q_values,
+                                               self.year_start_rows, self.year_new_states, results)
+                self.learning_stats['convergence'].append(signals)
+            self.year_start_rows = {}
+            self.year_new_states = 0
+            if self.monitor is not None and self.monitor.should_stop():
+                self.learning_stats['stop_reason'] = self.monitor.stop_reason
+                print(f"\nStopping early: {self.monitor.stop_reason}")
+                break
+
+        if self.plotter is not None:
+            self.plotter.render(self.learning_stats)  # Final years, including after an early stop
+        if self.run_store is not None:
+            self.run_store.finish_run(self.run_id, self.learning_stats['stop_reason'])
+
+    def get_run_config(self, num_years):
+        """Parameters identifying this run in the run store"""
+        return {
+            'num_years': num_years,
+            'alpha': self.initial_alpha,
+            'gamma': self.gamma,
+            'epsilon': self.initial_epsilon,
+            'batch_size': self.batch_size,
+            'replay_size': self.replay_buffer.maxlen,
+            'prioritized_replay': self.prioritized_replay,
+            'q_capacity': self.q_values.capacity,
+            'q_stale_years': self.q_values.stale_years,
+            'teams': {team.name: team.budget for team in self.conference.teams},
+        }
 
 
     def track_progress(self, year, results):
@@ -218,20 +304,40 @@ class SarsaAgent:
             print("Roster Sizes:",)
             print(f"ε: {self.epsilon:.3f} α: {self.alpha:.3f}")
             print("Roster Size:", {team.name: len(team.roster) for team in self.conference.teams})
+            print("Q-table:", self.q_values.stats())
             
 
-    def plot_learning(self):
-        """Comprehensive learning visualization"""
+    def save_learning_stats(self, path):
+        """Save learning_stats to a JSON metrics file"""
+        save_metrics(self.learning_stats, path)
+
+    def plot_learning(self, stats=None, path=None, buckets=500, window=1):
+        """Comprehensive learning visualization.
+
+        Args:
+            stats: learning_stats-shaped dict (e.g. RunStore.load_learning_stats
+                or learning_plots.load_metrics); defaults to this agent's in-memory stats
+            path: If given, render decimated plots headlessly to this PNG/SVG file
+                instead of opening an interactive window
+            buckets: Maximum plotted points per series when rendering to file
+            window: Rolling-mean window in years when rendering to file
+        """
+        if stats is None:
+            stats = self.learning_stats
+        if path is not None:
+            LearningPlotter(path, buckets=buckets, window=window).render(stats)
+            return
         if not plt:
             return
+        team_names = list(stats['budgets'])
             
         plt.figure(figsize=(15, 10))
         
         # Scores subplot
         plt.subplot(2, 2, 1)
-        for team in self.conference.teams:
-            scores = [score_dict[team.name] for score_dict in self.learning_stats['scores']]
-            plt.plot(self.learning_stats['years'], scores, label=team.name)
+        for name in team_names:
+            scores = [score_dict[name] for score_dict in stats['scores']]
+            plt.plot(stats['years'], scores, label=name)
         plt.title("Team Scores Over Time")
         plt.xlabel("Year")
         plt.ylabel("Conference Points")
@@ -239,10 +345,10 @@ class SarsaAgent:
         
         # Budgets subplot
         plt.subplot(2, 2, 2)
-        for team in self.conference.teams:
-            plt.plot(self.learning_stats['years'], 
-                    self.learning_stats['budgets'][team.name],
-                    label=team.name)
+        for name in team_names:
+            plt.plot(stats['years'], 
+                    stats['budgets'][name],
+                    label=name)
         plt.title("Team Budgets Over Time")
         plt.xlabel("Year")
         plt.ylabel("Budget ($10k)")
@@ -250,10 +356,10 @@ class SarsaAgent:
         
         # Rosters subplot
         plt.subplot(2, 2, 3)
-        for team in self.conference.teams:
-            plt.plot(self.learning_stats['years'],
-                    self.learning_stats['rosters'][team.name],
-                    label=team.name)
+        for name in team_names:
+            plt.plot(stats['years'],
+                    stats['rosters'][name],
+                    label=name)
         plt.title("Roster Sizes Over Time")
         plt.xlabel("Year")
         plt.ylabel("Swimmers")
@@ -261,12 +367,12 @@ class SarsaAgent:
         
         
         # Add final winner annotation
-        final_scores = self.learning_stats['scores'][-1]  # A dict of {team_name: score}
+        final_scores = stats['scores'][-1]  # A dict of {team_name: score}
         winner_name = max(final_scores, key=final_scores.get)
         winner_score = final_scores[winner_name]
         plt.subplot(2, 2, 1)
         plt.annotate(f"Winner: {winner_name}",
-             xy=(self.learning_stats['years'][-1], winner_score),
+             xy=(stats['years'][-1], winner_score),
              xytext=(-120, 30),
              textcoords='offset points',
              arrowprops=dict(arrowstyle="->", lw=1.5),
@@ -8,7 +8,7 @@ class Conference:
         9: 9, 10: 7, 11: 6, 12: 5, 13: 4, 14: 3, 15: 2, 16: 1    # B final
     }
     
-    def __init__(self, team_names, initial_budgets, pool_size=100):
+    def __init__(self, team_names, initial_budgets, pool_size=100, replenish_size=200):
         """
         Initialize a swimming conference.
         
@@ -16,11 +16,13 @@ class Conference:
             team_names (list): List of team names
             initial_budgets (list): List of initial budgets for teams
             pool_size (int): Size of recruit pool
+            replenish_size (int): Recruits generated each new year (0 when a League supplies them)
         """
         
             
         self.teams = [Team(name, budget) for name, budget in zip(team_names, initial_budgets)]
         self.recruit_pool = RecruitPool(pool_size)
+        self.replenish_size = replenish_size
         self.history = []  # Store historical results
         
     def simulate_bidding(self):
@@ -203,7 +205,7 @@ class Conference:
             team.decrement_years()
         
         # Replenish recruit pool
-        self.recruit_pool.replenish(200)
+        self.recruit_pool.replenish(self.replenish_size)
         
     
     
@@ -0,0 +1,104 @@
+import numpy as np
+from collections import deque
+
+
+class ConvergenceMonitor:
+    def __init__(self, patience=3, q_delta_norm_tol=0.15, q_delta_max_tol=0.3,
+                 policy_change_tol=0.002, discovery_tol=0.01, standings_var_tol=None,
+                 window=10, min_years=50):
+        """
+        Tracks per-year convergence signals of a SarsaAgent and decides when to stop.
+
+        Training stops once every enabled threshold holds for `patience`
+        consecutive years. Pass None for a tolerance to ignore that signal.
+
+        Args:
+            patience (int): Consecutive converged years required to stop (K)
+            q_delta_norm_tol (float): Max L2 norm of the year's Q-value changes, relative
+                to the L2 norm of the updated rows
+            q_delta_max_tol (float): Max absolute change of any single Q-value, relative
+                to the largest |Q| in the updated rows
+            policy_change_tol (float): Max fraction of states whose greedy action changed
+            discovery_tol (float): Max fraction of the Q-table made of newly seen states
+            standings_var_tol (float): Max mean rolling variance of team ranks
+            window (int): Years in the rolling standings window
+            min_years (int): Never stop before this many years
+        """
+        self.patience = patience
+        self.tolerances = {
+            'q_delta_norm': q_delta_norm_tol,
+            'q_delta_max': q_delta_max_tol,
+            'policy_change': policy_change_tol,
+            'discovery_rate': discovery_tol,
+            'standings_var': standings_var_tol,
+        }
+        self.min_years = min_years
+        self.ranks = deque(maxlen=window)
+        self.history = []  # One signals dict per observed year
+        self.streak = 0
+        self.stop_reason = None
+
+    @staticmethod
+    def relative(delta, scale):
+        """delta as a fraction of scale, so thresholds don't depend on the reward scale"""
+        return float(delta / scale) if scale > 0 else 0.0
+
+    @staticmethod
+    def greedy_action(row):
+        return max(row, key=row.get)
+
+    def observe(self, year, q_values, start_rows, new_states, results):
+        """
+        Compute this year's signals and update the stopping decision.
+
+        Args:
+            year (int): Training year just completed
+            q_values (QStore): The agent's Q-table after the year
+            start_rows (dict): {state: Q-row as it was before its first update this year}
+            new_states (int): States first added to the Q-table this year
+            results (list): Sorted (team_name, score) conference results
+
+        Returns:
+            dict: The signals recorded for this year
+        """
+        deltas = []
+        values = []  # Q-values of the touched rows after the year, to scale the deltas
+        policy_changes = 0
+        for state, old_row in start_rows.items():
+            if state not in q_values:
+                continue  # Evicted since its first update
+            row = q_values[state]
+            deltas.extend(row[a] - old_row[a] for a in row)
+            values.extend(row.values())
+            if self.greedy_action(row) != self.greedy_action(old_row):
+                policy_changes += 1
+        deltas = np.abs(np.asarray(deltas, dtype=float))
+        values = np.abs(np.asarray(values, dtype=float))
+        num_states = max(len(q_values), 1)
+
+        self.ranks.append({name: rank for rank, (name, _) in enumerate(results, start=1)})
+        if len(self.ranks) > 1:
+            teams = self.ranks[-1].keys()
+            standings_var = float(np.mean([np.var([r.get(t, 0) for r in self.ranks]) for t in teams]))
+        else:
+            standings_var = float('inf')
+
+        signals = {
+            'year': year,
+            'q_delta_norm': self.relative(np.linalg.norm(deltas), np.linalg.norm(values)) if deltas.size else 0.0,
+            'q_delta_max': self.relative(deltas.max(), values.max()) if deltas.size else 0.0,
+            'policy_change': policy_changes / num_states,
+            'discovery_rate': new_states / num_states,
+            'standings_var': standings_var,
+        }
+        self.history.append(signals)
+
+        converged = all(signals[key] <= tol for key, tol in self.tolerances.items() if tol is not None)
+        self.streak = self.streak + 1 if converged else 0
+        if self.streak >= self.patience and len(self.history) >= self.min_years:
+            enabled = ", ".join(f"{key}<={tol}" for key, tol in self.tolerances.items() if tol is not None)
+            self.stop_reason = f"converged at year {year}: {enabled} for {self.streak} consecutive years"
+        return signals
+
+    def should_stop(self):
+        return self.stop_reason is not None
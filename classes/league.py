@@ -0,0 +1,338 @@
+import os
+import random
+import time
+import numpy as np
+from multiprocessing import Pipe, Process, shared_memory
+from conference import Conference
+from recruit_pool import RecruitPool
+from run_store import RunStore
+from SarsaAgent import SarsaAgent
+from swimmer import Swimmer
+
+
+class RecruitMarket:
+    EVENT_TYPES = RecruitPool.EVENT_TYPES
+    # Row layout: scholarship, team fit, one time per event, one placement per event (NaN = no swim)
+    SCHOLARSHIP, TEAM_FIT, TIMES = 0, 1, 2
+    PLACEMENTS = TIMES + len(EVENT_TYPES)
+    COLUMNS = PLACEMENTS + len(EVENT_TYPES)
+
+    def __init__(self, class_size=400, buffer=None):
+        """
+        Central market publishing one national recruit class per year.
+
+        Args:
+            class_size (int): Recruits in each yearly class
+            buffer: Optional shared memory buffer backing the class array
+        """
+        self.class_size = class_size
+        self.recruits = np.ndarray((class_size, self.COLUMNS), dtype=np.float32, buffer=buffer)
+
+    def publish(self):
+        """Generate a new class, best projected swimmers first, into the shared array."""
+        swimmers = [Swimmer.generate_random_swimmer(self.EVENT_TYPES) for _ in range(self.class_size)]
+        swimmers.sort(key=lambda s: -s.get_score_contribution())
+        self.recruits[:] = np.nan
+        for i, swimmer in enumerate(swimmers):
+            self.recruits[i, self.SCHOLARSHIP] = swimmer.scholarship
+            self.recruits[i, self.TEAM_FIT] = swimmer.team_fit
+            for event in swimmer.events:
+                j = self.EVENT_TYPES.index(event)
+                self.recruits[i, self.TIMES + j] = swimmer.event_times[event]
+                self.recruits[i, self.PLACEMENTS + j] = swimmer.event_placements[event]
+
+    @classmethod
+    def decode(cls, recruits):
+        """Rebuild Swimmer objects from a published class array."""
+        swimmers = []
+        for i, row in enumerate(recruits):
+            events = [e for j, e in enumerate(cls.EVENT_TYPES) if not np.isnan(row[cls.TIMES + j])]
+            event_times = {e: float(row[cls.TIMES + cls.EVENT_TYPES.index(e)]) for e in events}
+            event_placements = {e: int(row[cls.PLACEMENTS + cls.EVENT_TYPES.index(e)]) for e in events}
+            swimmers.append(Swimmer(f"Recruit {i}", events, event_placements, event_times,
+                                    int(row[cls.SCHOLARSHIP]), int(row[cls.TEAM_FIT])))
+        return swimmers
+
+    def resolve(self, bids, capacities):
+        """
+        Award each recruit to the highest affordable bid across all conferences.
+
+        Args:
+            bids (ndarray): Rows of (conference_id, team_idx, recruit_idx, amount)
+            capacities (dict): {conference_id: [[budget, roster_space], ...] per team}
+
+        Returns:
+            dict: {conference_id: [(team_idx, recruit_idx, amount), ...]}
+        """
+        signings = {conf_id: [] for conf_id in capacities}
+        if not len(bids):
+            return signings
+
+        # Recruit by recruit, highest bid first, random order among equal bids
+        order = np.lexsort((np.random.random(len(bids)), -bids[:, 3], bids[:, 2]))
+        signed = np.zeros(self.class_size, dtype=bool)
+        for conf_id, team_idx, recruit_idx, amount in bids[order].tolist():
+            if signed[recruit_idx]:
+                continue
+            budget, roster_space = capacities[conf_id][team_idx]
+            if amount > budget or roster_space <= 0:
+                continue
+            capacities[conf_id][team_idx] = [budget - amount, roster_space - 1]
+            signed[recruit_idx] = True
+            signings[conf_id].append((team_idx, recruit_idx, amount))
+        return signings
+
+
+class ConferenceShard:
+    def __init__(self, specs, agent_kwargs):
+        """
+        The conferences and agents owned by one worker process.
+
+        Args:
+            specs (list): (conference_id, team_names, initial_budgets) per conference
+            agent_kwargs (dict): Keyword arguments for every SarsaAgent
+        """
+        self.agents = {
+            conf_id: SarsaAgent(Conference(names, budgets, pool_size=0, replenish_size=0), **agent_kwargs)
+            for conf_id, names, budgets in specs
+        }
+        self.swimmers = []
+        self.decisions = {}  # conference_id -> [(team_idx, state, action, recruit_idx)] made this year
+
+    def propose_bids(self, recruits):
+        """Choose every team's action on every recruit and return bids plus budgets."""
+        self.swimmers = RecruitMarket.decode(recruits)
+        self.decisions = {}
+        bids = []
+        capacities = {}
+        for conf_id, agent in self.agents.items():
+            agent.decay_parameters()
+            teams = agent.conference.teams
+            decisions = self.decisions[conf_id] = []
+            capacities[conf_id] = [[team.budget, 20 - len(team.roster)] for team in teams]
+            for recruit_idx, swimmer in enumerate(self.swimmers):
+                for team_idx, team in enumerate(teams):
+                    if team.budget <= 0:
+                        continue
+                    state = agent.get_state_key(team, swimmer)
+                    action = agent.choose_action(state, team, swimmer)
+                    decisions.append((team_idx, state, action, recruit_idx))
+                    if action >= swimmer.scholarship and team.budget >= action:
+                        bids.append((conf_id, team_idx, recruit_idx, action))
+        return np.asarray(bids, dtype=np.int32).reshape(-1, 4), capacities
+
+    def sign_and_compete(self, signings):
+        """
+        Apply the market's signings, run each conference meet and learn from the year.
+
+        Returns:
+            dict: {conference_id: {'results', 'teams', 'epsilon', 'alpha', 'q_states'}} where
+                'teams' are RunStore.team_rows for the year
+        """
+        year_reports = {}
+        for conf_id, agent in self.agents.items():
+            teams = agent.conference.teams
+            signed = set()
+            for team_idx, recruit_idx, amount in signings.get(conf_id, []):
+                if teams[team_idx].make_bid(self.swimmers[recruit_idx], amount):
+                    signed.add((team_idx, recruit_idx))
+
+            # Immediate rewards for decisions that did not land a recruit
+            year_bids = []
+            for team_idx, state, action, recruit_idx in self.decisions[conf_id]:
+                team, swimmer = teams[team_idx], self.swimmers[recruit_idx]
+                if (team_idx, recruit_idx) in signed:
+                    year_bids.append((team, state, action, swimmer))
+                    continue
+                reward = agent.calculate_reward(team, swimmer, action)
+                next_state = agent.get_state_key(team, swimmer)
+                next_action = agent.choose_action(next_state, team, swimmer)
+                agent.update_q_values(state, action, reward, next_state, next_action)
+
+            results = agent.conference.simulate_conference_meet()
+
+            # End-of-year rewards for successful signings
+            for team, state, action, swimmer in year_bids:
+                full_reward = agent.calculate_reward(team, swimmer, action, results)
+                next_state = agent.get_state_key(team, swimmer)
+                next_action = agent.choose_action(next_state, team, swimmer)
+                agent.update_q_values(state, action, full_reward, next_state, next_action)
+
+            class_counts = RunStore.class_counts(teams)  # Roster that competed
+            agent.conference.advance_year()
+            agent.track_progress(agent.training_year, results)
+            year_reports[conf_id] = {
+                'results': results,
+                'teams': RunStore.team_rows(teams, class_counts),
+                'epsilon': agent.epsilon,
+                'alpha': agent.alpha,
+                'q_states': len(agent.q_values),
+            }
+        return year_reports
+
+
+def _run_shard(conn, shm_name, class_size, specs, agent_kwargs, seed):
+    """Worker process loop: serve bid/sign requests for one ConferenceShard."""
+    random.seed(seed)
+    np.random.seed(None if seed is None else seed % 2**32)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    market = RecruitMarket(class_size, buffer=shm.buf)
+    shard = ConferenceShard(specs, agent_kwargs)
+    try:
+        while True:
+            command, payload = conn.recv()
+            if command == "bid":
+                conn.send(shard.propose_bids(market.recruits))
+            elif command == "sign":
+                conn.send(shard.sign_and_compete(payload))
+            else:
+                break
+    finally:
+        del market
+        shm.close()
+        conn.close()
+
+
+class League:
+    def __init__(self, conferences, class_size=400, num_workers=None, seed=None, run_store=None,
+                 **agent_kwargs):
+        """
+        Many conferences competing for one national recruit class, sharded across processes.
+
+        Each year the market publishes the class into shared memory, every worker
+        returns its conferences' bids in one batch, the market resolves conflicts
+        centrally and sends back signings, and the workers then run their meets
+        in parallel.
+
+        Args:
+            conferences (list): (team_names, initial_budgets) per conference
+            class_size (int): Recruits in each yearly national class
+            num_workers (int): Worker processes (defaults to the CPU count)
+            seed (int): Optional seed for the market and the workers
+            run_store: Optional RunStore; each conference is stored as its own run,
+                written from this (parent) process
+            **agent_kwargs: Passed to each conference's SarsaAgent
+        """
+        if not conferences:
+            raise ValueError("A league needs at least one conference")
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+        num_workers = min(num_workers or os.cpu_count() or 1, len(conferences))
+
+        self.closed = False
+        self.market = None
+        self.conns = []
+        self.workers = []
+        self.shard_conferences = []  # Conference ids hosted by each worker
+        self.run_store = run_store
+        self.run_ids = {}            # conference_id -> run id in run_store
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=class_size * RecruitMarket.COLUMNS * np.dtype(np.float32).itemsize
+        )
+        try:
+            self.market = RecruitMarket(class_size, buffer=self.shm.buf)
+            for i in range(num_workers):
+                specs = [(conf_id, names, budgets)
+                         for conf_id, (names, budgets) in enumerate(conferences)
+                         if conf_id % num_workers == i]
+                parent_conn, child_conn = Pipe()
+                worker = Process(
+                    target=_run_shard,
+                    args=(child_conn, self.shm.name, class_size, specs, agent_kwargs,
+                          None if seed is None else seed + i + 1),
+                    daemon=True
+                )
+                self.conns.append(parent_conn)
+                worker.start()
+                child_conn.close()
+                self.workers.append(worker)
+                self.shard_conferences.append([conf_id for conf_id, _, _ in specs])
+
+            if run_store is not None:
+                for conf_id, (names, budgets) in enumerate(conferences):
+                    config = {
+                        'league_conferences': len(conferences),
+                        'conference': conf_id,
+                        'class_size': class_size,
+                        'num_workers': num_workers,
+                        'teams': dict(zip(names, budgets)),
+                        'agent': agent_kwargs,
+                    }
+                    self.run_ids[conf_id] = run_store.start_run(config, seed)
+        except BaseException:
+            # Don't leak the shared memory segment or half-started workers
+            self.close()
+            raise
+
+        self.year = 0
+        self.history = []     # {conference_id: sorted results} per year
+        self.year_times = []  # Wall time per league-year
+
+    def run_year(self):
+        """Simulate one league-year and return {conference_id: results}."""
+        start = time.perf_counter()
+        self.market.publish()
+
+        for conn in self.conns:
+            conn.send(("bid", None))
+        all_bids, capacities = [], {}
+        for conn in self.conns:
+            bids, caps = conn.recv()
+            all_bids.append(bids)
+            capacities.update(caps)
+
+        signings = self.market.resolve(np.concatenate(all_bids), capacities)
+
+        for conn, conf_ids in zip(self.conns, self.shard_conferences):
+            conn.send(("sign", {conf_id: signings[conf_id] for conf_id in conf_ids}))
+        reports = {}
+        for conn in self.conns:
+            reports.update(conn.recv())
+
+        self.year += 1
+        self.year_times.append(time.perf_counter() - start)
+        self.history.append({conf_id: reports[conf_id]['results'] for conf_id in sorted(reports)})
+        if self.run_store is not None:
+            for conf_id, report in reports.items():
+                self.run_store.record_year(self.run_ids[conf_id], self.year, report['results'],
+                                           report['teams'], report['epsilon'], report['alpha'],
+                                           report['q_states'], self.year_times[-1])
+        return self.history[-1]
+
+    def run(self, num_years):
+        """Simulate several league-years, printing a one-line summary of each."""
+        for _ in range(num_years):
+            results = self.run_year()
+            winners = {conf_id: standings[0][0] for conf_id, standings in results.items()}
+            print(f"League year {self.year}: {self.year_times[-1]:.2f}s, winners {winners}")
+        return self.history
+
+    def close(self):
+        """Stop the workers and release the shared recruit class. Safe to call more than once."""
+        if self.closed:
+            return
+        self.closed = True
+        for run_id in self.run_ids.values():
+            self.run_store.finish_run(run_id)
+        for conn in self.conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self.workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        for conn in self.conns:
+            conn.close()
+        self.market = None  # Release the numpy view so the buffer can be closed
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
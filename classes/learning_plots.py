@@ -0,0 +1,150 @@
+import json
+from collections import deque
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+def save_metrics(stats, path):
+    """Write a learning_stats dict to a JSON metrics file."""
+    with open(path, "w") as f:
+        json.dump(stats, f)
+
+
+def load_metrics(path):
+    """Read a learning_stats dict back from a JSON metrics file."""
+    with open(path) as f:
+        return json.load(f)
+
+
+class BucketSeries:
+    def __init__(self, max_buckets, window=1):
+        """
+        Running min/max/mean buckets over a series that only ever grows.
+
+        Each bucket covers `width` consecutive points. When there are more than
+        max_buckets buckets, adjacent pairs are merged and the width doubles, so
+        adding a point is amortized O(1) and memory stays O(max_buckets).
+
+        Args:
+            max_buckets (int): Maximum buckets kept
+            window (int): Rolling-mean window applied to points as they arrive
+        """
+        self.max_buckets = max(2, max_buckets)
+        self.width = 1
+        self.buckets = []  # [min, max, sum, count, year_sum]
+        self.recent = deque(maxlen=max(1, window))
+        self.recent_sum = 0.0
+
+    def add(self, year, value):
+        """Fold one point (smoothed over the rolling window) into the last bucket."""
+        if len(self.recent) == self.recent.maxlen:
+            self.recent_sum -= self.recent[0]
+        self.recent.append(value)
+        self.recent_sum += value
+        value = self.recent_sum / len(self.recent)
+
+        last = self.buckets[-1] if self.buckets else None
+        if last is not None and last[3] < self.width:
+            last[0] = min(last[0], value)
+            last[1] = max(last[1], value)
+            last[2] += value
+            last[3] += 1
+            last[4] += year
+        else:
+            self.buckets.append([value, value, value, 1, year])
+            if len(self.buckets) > self.max_buckets:
+                self.merge()
+
+    def merge(self):
+        """Halve the bucket count by combining adjacent pairs."""
+        merged = []
+        for i in range(0, len(self.buckets), 2):
+            pair = self.buckets[i:i + 2]
+            merged.append([
+                min(b[0] for b in pair), max(b[1] for b in pair),
+                sum(b[2] for b in pair), sum(b[3] for b in pair), sum(b[4] for b in pair)
+            ])
+        self.buckets = merged
+        self.width *= 2
+
+    def arrays(self):
+        """Return (bucket_years, mins, maxs, means) as numpy arrays."""
+        b = np.asarray(self.buckets, dtype=float).reshape(-1, 5)
+        return b[:, 4] / b[:, 3], b[:, 0], b[:, 1], b[:, 2] / b[:, 3]
+
+
+class LearningPlotter:
+    PANELS = [
+        ("scores", "Team Scores Over Time", "Conference Points"),
+        ("budgets", "Team Budgets Over Time", "Budget ($10k)"),
+        ("rosters", "Roster Sizes Over Time", "Swimmers"),
+    ]
+
+    def __init__(self, path="learning.png", buckets=500, window=1, render_every=None):
+        """
+        Headless, decimated renderer for learning curves of arbitrarily long runs.
+
+        New years are folded into fixed-size BucketSeries as they arrive, so a
+        render costs O(buckets) however long the run. A plotter follows one run:
+        it only ingests years of `stats` it has not seen yet.
+
+        Args:
+            path (str): Output file; the extension (.png/.svg) picks the format
+            buckets (int): Maximum plotted points per series
+            window (int): Rolling-mean window in years (1 disables smoothing)
+            render_every (int): Re-render every N training years (None disables)
+        """
+        self.path = path
+        self.buckets = buckets
+        self.window = window
+        self.render_every = render_every
+        self.series = {key: {} for key, _, _ in self.PANELS}  # panel -> {team_name: BucketSeries}
+        self.years_seen = 0
+
+    def ingest(self, stats):
+        """Fold the years of a learning_stats dict not yet seen into the buckets."""
+        for i in range(self.years_seen, len(stats['years'])):
+            year = stats['years'][i]
+            for name in stats['budgets']:
+                values = {
+                    "scores": stats['scores'][i].get(name, 0),
+                    "budgets": stats['budgets'][name][i],
+                    "rosters": stats['rosters'][name][i],
+                }
+                for key, value in values.items():
+                    if name not in self.series[key]:
+                        self.series[key][name] = BucketSeries(self.buckets, self.window)
+                    self.series[key][name].add(year, value)
+        self.years_seen = len(stats['years'])
+
+    def render(self, stats=None, path=None):
+        """Render the learning curves to a file with the Agg backend."""
+        if stats is not None:
+            self.ingest(stats)
+        if not self.years_seen:
+            return
+        path = path or self.path
+        fig = Figure(figsize=(15, 10))
+        FigureCanvasAgg(fig)
+
+        for i, (key, title, ylabel) in enumerate(self.PANELS, start=1):
+            ax = fig.add_subplot(2, 2, i)
+            for name, series in self.series[key].items():
+                x, lo, hi, mean = series.arrays()
+                line, = ax.plot(x, mean, label=name)
+                if series.width > 1:
+                    ax.fill_between(x, lo, hi, color=line.get_color(), alpha=0.2, linewidth=0)
+            ax.set_title(title)
+            ax.set_xlabel("Year")
+            ax.set_ylabel(ylabel)
+            ax.legend()
+
+        fig.tight_layout()
+        fig.savefig(path)
+
+    def update(self, stats, year):
+        """Fold in the latest years and re-render once every render_every years."""
+        self.ingest(stats)
+        if self.render_every and year % self.render_every == 0:
+            self.render()
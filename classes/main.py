@@ -6,19 +6,40 @@ except ImportError:
     print("Install it with: pip install matplotlib")
     matplotlib_available = False
 
+import random
+import numpy as np
 from conference import Conference
 from SarsaAgent import SarsaAgent
+from run_store import RunStore
+from convergence import ConvergenceMonitor
+from league import League
+
+def run_simulation(num_years, db_path=None, seed=None, early_stop=False):
+    """Enhanced simulation with detailed tracking.
+
+    Args:
+        num_years: Number of years to simulate
+        db_path: Optional SQLite file that results are persisted to
+        seed: Optional seed for reproducible runs
+        early_stop: Stop before num_years once a default ConvergenceMonitor sees convergence
+    """
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
 
-def run_simulation(num_years):
-    """Enhanced simulation with detailed tracking"""
     team_names = ["Team A", "Team B", "Team C", "Max Team", "Random Team"]
     initial_budgets = [500, 500, 500, 500,500]  # $10k units
     
     conference = Conference(team_names, initial_budgets)
-    agent = SarsaAgent(conference, alpha=0.2, gamma=0.95, epsilon=0.3)
+    run_store = RunStore(db_path) if db_path else None
+    agent = SarsaAgent(conference, alpha=0.2, gamma=0.95, epsilon=0.3,
+                       run_store=run_store, seed=seed,
+                       monitor=ConvergenceMonitor() if early_stop else None)
     
     #print(f"Starting {num_years} year simulation...")
     agent.train(num_years=num_years)
+    if run_store is not None:
+        run_store.close()
     
     if matplotlib_available:
        agent.plot_learning()
@@ -26,6 +47,25 @@ def run_simulation(num_years):
     return conference, agent
 
 
+def run_league_simulation(num_years, num_conferences=8, num_workers=None, seed=None, db_path=None):
+    """Many conferences sharing one national recruit class, run across worker processes.
+
+    Args:
+        db_path: Optional SQLite file; each conference is persisted as its own run
+    """
+    conferences = [
+        ([f"Conf {c} Team {t}" for t in "ABCDE"], [500, 500, 500, 500, 500])
+        for c in range(num_conferences)
+    ]
+    run_store = RunStore(db_path) if db_path else None
+    with League(conferences, num_workers=num_workers, seed=seed, run_store=run_store,
+                alpha=0.2, gamma=0.95, epsilon=0.3) as league:
+        league.run(num_years)
+    if run_store is not None:
+        run_store.close()
+    return league
+
+
 if __name__ == "__main__":
     num_years = 200
     conference, agent = run_simulation(num_years)
\ No newline at end of file
@@ -0,0 +1,135 @@
+from collections import OrderedDict
+
+
+class QStore:
+    def __init__(self, actions, capacity=None, evict_fraction=0.1, stale_years=None,
+                 evicted_memory=None):
+        """
+        Capacity-bounded Q-table keyed by state, with one {action: value} row per state.
+
+        When full, the store evicts a batch of entries at once: never-updated
+        (all-zero) rows first, fewest visits first, then the least recently
+        used rows. With stale_years set, rows untouched for that many training
+        years are also dropped at each year boundary, full or not.
+
+        Args:
+            actions (list): Actions every row holds a value for
+            capacity (int): Maximum number of states kept (None for unbounded)
+            evict_fraction (float): Share of capacity freed per eviction pass
+            stale_years (int): Drop rows not looked up for this many years (None keeps them)
+            evicted_memory (int): Recently evicted states remembered so their re-insertion is
+                not counted as a new state (defaults to capacity, or 1000 if unbounded)
+        """
+        self.actions = actions
+        self.capacity = capacity
+        self.evict_count = max(1, int(capacity * evict_fraction)) if capacity else 0
+        self.stale_years = stale_years
+        self.rows = OrderedDict()   # state -> {action: q}, least recently used first
+        self.visits = {}            # state -> number of lookups
+        self.last_year = {}         # state -> training year of last lookup
+        self.evicted = OrderedDict()  # Most recently evicted states, oldest first (bounded)
+        self.evicted_memory = evicted_memory or capacity or 1000
+        self.year = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reinserts = 0
+
+    def default_row(self):
+        return {a: 0 for a in self.actions}
+
+    def touch(self, state):
+        self.rows.move_to_end(state)
+        self.visits[state] += 1
+        self.last_year[state] = self.year
+
+    def is_new(self, state):
+        """True if the state is neither stored nor among the recently evicted ones."""
+        return state not in self.rows and state not in self.evicted
+
+    def advance_year(self, year):
+        """Set the training year and drop rows untouched for stale_years years."""
+        self.year = year
+        if not self.stale_years:
+            return
+        # Rows are in LRU order, so the stale ones form a prefix
+        stale = []
+        for state in self.rows:
+            if year - self.last_year[state] < self.stale_years:
+                break
+            stale.append(state)
+        self.drop(stale)
+
+    def get(self, state):
+        """Read-only lookup: returns a fresh zero row for unseen states without inserting."""
+        if state in self.rows:
+            self.hits += 1
+            self.touch(state)
+            return self.rows[state]
+        self.misses += 1
+        return self.default_row()
+
+    def row(self, state):
+        """Writable lookup: returns the stored row, inserting a zero row if needed."""
+        if state in self.rows:
+            self.hits += 1
+        else:
+            self.misses += 1
+            if self.evicted.pop(state, None) is not None:
+                self.reinserts += 1
+            if self.capacity and len(self.rows) >= self.capacity:
+                self.evict()
+            self.rows[state] = self.default_row()
+            self.visits[state] = 0
+        self.touch(state)
+        return self.rows[state]
+
+    def evict(self):
+        """Drop evict_count states: cold (all-zero) rows by visit count, then LRU rows."""
+        cold = [s for s, row in self.rows.items() if not any(row.values())]
+        cold.sort(key=lambda s: self.visits[s])  # Stable, so ties stay in LRU order
+        victims = cold[:self.evict_count]
+        if len(victims) < self.evict_count:
+            cold_set = set(victims)
+            for state in self.rows:
+                if len(victims) >= self.evict_count:
+                    break
+                if state not in cold_set:
+                    victims.append(state)
+
+        self.drop(victims)
+
+    def drop(self, states):
+        for state in states:
+            del self.rows[state]
+            del self.visits[state]
+            del self.last_year[state]
+            self.evicted[state] = True
+            if len(self.evicted) > self.evicted_memory:
+                self.evicted.popitem(last=False)
+        self.evictions += len(states)
+
+    def stats(self):
+        """Hit/miss/eviction counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.rows),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'reinserts': self.reinserts,
+        }
+
+    def __getitem__(self, state):
+        return self.rows[state]
+
+    def __contains__(self, state):
+        return state in self.rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def items(self):
+        return self.rows.items()
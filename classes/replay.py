@@ -0,0 +1,109 @@
+import math
+import random
+import numpy as np
+
+
+class SumTree:
+    def __init__(self, capacity):
+        """
+        Array-backed binary sum tree over `capacity` leaf priorities.
+
+        Internal node i holds the sum of its children 2i+1 and 2i+2, so the
+        root is the total priority; leaves start at index capacity-1.
+        Updates and proportional lookups are O(log capacity). The flat array is a
+        plain list because scalar indexing it is much cheaper than a numpy array.
+        """
+        self.capacity = capacity
+        self.tree = [0.0] * (2 * capacity - 1)
+        self.data = [None] * capacity
+        self.next_index = 0
+        self.size = 0
+
+    def total(self):
+        return self.tree[0]
+
+    def add(self, priority, data):
+        """Store data with the given priority, overwriting the oldest entry when full."""
+        self.data[self.next_index] = data
+        self.update(self.next_index + self.capacity - 1, priority)
+        self.next_index = (self.next_index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def update(self, leaf, priority):
+        """Set a leaf's priority and recompute its ancestors' sums up to the root."""
+        tree = self.tree
+        tree[leaf] = priority
+        while leaf:
+            leaf = (leaf - 1) // 2
+            # Re-sum children rather than adding a delta, so rounding error can't accumulate
+            tree[leaf] = tree[2 * leaf + 1] + tree[2 * leaf + 2]
+
+    def find(self, value):
+        """Return (leaf, priority, data) for the leaf whose cumulative range holds value."""
+        value = min(value, math.nextafter(self.total(), 0))
+        idx = 0
+        while idx < self.capacity - 1:
+            left = 2 * idx + 1
+            # Rounding in `value -= ...` can leave value just past the left sum; never
+            # descend into an all-zero right subtree (unfilled slots) because of it
+            if value < self.tree[left] or self.tree[left + 1] == 0:
+                idx = left
+            else:
+                value -= self.tree[left]
+                idx = left + 1
+        return idx, self.tree[idx], self.data[idx - self.capacity + 1]
+
+
+class PrioritizedReplayBuffer:
+    def __init__(self, capacity=1000, alpha=0.6, beta=0.4, beta_increment=1e-4, epsilon=1e-3):
+        """
+        Replay buffer sampling transitions in proportion to |TD error|^alpha.
+
+        Args:
+            capacity (int): Maximum number of stored transitions
+            alpha (float): Prioritization strength (0 = uniform)
+            beta (float): Initial importance-sampling correction, annealed to 1
+            beta_increment (float): Amount beta grows per sampled batch
+            epsilon (float): Floor added to |TD error| so no transition starves
+        """
+        self.tree = SumTree(capacity)
+        self.maxlen = capacity
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+
+    def append(self, transition):
+        """Add a transition at the current max priority so it is replayed at least once soon."""
+        self.tree.add(self.max_priority, transition)
+
+    def sample(self, batch_size):
+        """
+        Draw a stratified proportional batch.
+
+        Returns:
+            tuple: (leaves, transitions, importance-sampling weights)
+        """
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        segment = self.tree.total() / batch_size
+        leaves, transitions, priorities = [], [], []
+        for i in range(batch_size):
+            leaf, priority, transition = self.tree.find(random.uniform(segment * i, segment * (i + 1)))
+            leaves.append(leaf)
+            transitions.append(transition)
+            priorities.append(priority)
+
+        probabilities = np.asarray(priorities) / self.tree.total()
+        weights = (self.tree.size * probabilities) ** -self.beta
+        return leaves, transitions, weights / weights.max()
+
+    def update_priorities(self, leaves, td_errors):
+        """Refresh sampled transitions' priorities from their latest TD errors."""
+        for leaf, td_error in zip(leaves, td_errors):
+            priority = (abs(td_error) + self.epsilon) ** self.alpha
+            self.tree.update(leaf, priority)
+            self.max_priority = max(self.max_priority, priority)
+
+    def __len__(self):
+        return self.tree.size
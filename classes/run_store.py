@@ -0,0 +1,166 @@
+import json
+import sqlite3
+import time
+
+
+class RunStore:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at  REAL NOT NULL,
+            finished_at REAL,
+            seed        INTEGER,
+            config      TEXT NOT NULL,
+            stop_reason TEXT
+        );
+        CREATE TABLE IF NOT EXISTS standings (
+            run_id      INTEGER NOT NULL REFERENCES runs(run_id),
+            year        INTEGER NOT NULL,
+            team        TEXT NOT NULL,
+            rank        INTEGER NOT NULL,
+            score       INTEGER NOT NULL,
+            budget      INTEGER NOT NULL,
+            roster_size INTEGER NOT NULL,
+            freshmen    INTEGER NOT NULL,
+            sophomores  INTEGER NOT NULL,
+            juniors     INTEGER NOT NULL,
+            seniors     INTEGER NOT NULL,
+            PRIMARY KEY (run_id, year, team)
+        );
+        CREATE TABLE IF NOT EXISTS agent_stats (
+            run_id      INTEGER NOT NULL REFERENCES runs(run_id),
+            year        INTEGER NOT NULL,
+            epsilon     REAL NOT NULL,
+            alpha       REAL NOT NULL,
+            q_states    INTEGER NOT NULL,
+            seconds     REAL NOT NULL,
+            PRIMARY KEY (run_id, year)
+        );
+        CREATE INDEX IF NOT EXISTS idx_standings_team_year ON standings(team, year);
+        CREATE INDEX IF NOT EXISTS idx_runs_seed ON runs(seed);
+    """
+
+    def __init__(self, path="race4recruits.db", commit_every=10):
+        """
+        SQLite-backed store of results, standings and agent stats across runs.
+
+        Args:
+            path (str): Database file (":memory:" for a throwaway store)
+            commit_every (int): Years buffered per transaction
+        """
+        self.path = path
+        self.commit_every = max(1, commit_every)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(self.SCHEMA)
+        self._standings = []
+        self._agent_stats = []
+        self._pending_years = 0
+
+    def start_run(self, config, seed=None):
+        """Register a new run and return its id."""
+        cursor = self.conn.execute(
+            "INSERT INTO runs (started_at, seed, config) VALUES (?, ?, ?)",
+            (time.time(), seed, json.dumps(config, sort_keys=True, default=str))
+        )
+        self.conn.commit()
+        return cursor.lastrowid
+
+    @staticmethod
+    def class_counts(teams):
+        """{team_name: (freshmen, sophomores, juniors, seniors)}; take before Conference.advance_year."""
+        counts = {}
+        for team in teams:
+            by_years = {1: 0, 2: 0, 3: 0, 4: 0}
+            for swimmer, _ in team.roster:
+                by_years[swimmer.years_remaining] += 1
+            counts[team.name] = (by_years[4], by_years[3], by_years[2], by_years[1])
+        return counts
+
+    @staticmethod
+    def team_rows(teams, class_counts):
+        """(name, budget, roster_size, freshmen, sophomores, juniors, seniors) per team.
+
+        Budget and roster size are read now, matching SarsaAgent.track_progress, while
+        class_counts should describe the roster that competed (see class_counts).
+        """
+        return [(team.name, team.budget, len(team.roster)) + class_counts[team.name] for team in teams]
+
+    def record_year(self, run_id, year, results, team_rows, epsilon, alpha, q_states, seconds):
+        """Buffer one year of standings and agent stats; flushed every commit_every years."""
+        ranks = {name: rank for rank, (name, _) in enumerate(results, start=1)}
+        scores = dict(results)
+        for name, budget, roster_size, *class_counts in team_rows:
+            self._standings.append((
+                run_id, year, name, ranks.get(name, len(results) + 1),
+                scores.get(name, 0), budget, roster_size, *class_counts
+            ))
+        self._agent_stats.append((run_id, year, epsilon, alpha, q_states, seconds))
+
+        self._pending_years += 1
+        if self._pending_years >= self.commit_every:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered years in a single transaction."""
+        if not self._pending_years:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO standings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._standings
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO agent_stats VALUES (?, ?, ?, ?, ?, ?)",
+                self._agent_stats
+            )
+        self._standings = []
+        self._agent_stats = []
+        self._pending_years = 0
+
+    def finish_run(self, run_id, stop_reason=None):
+        """Flush remaining years and stamp the run as finished (and why, if it stopped early)."""
+        self.flush()
+        with self.conn:
+            self.conn.execute(
+                "UPDATE runs SET finished_at = ?, stop_reason = ? WHERE run_id = ?",
+                (time.time(), stop_reason, run_id)
+            )
+
+    def get_runs(self):
+        """Return (run_id, started_at, finished_at, seed, config, stop_reason) for every run."""
+        rows = self.conn.execute(
+            "SELECT run_id, started_at, finished_at, seed, config, stop_reason FROM runs ORDER BY run_id"
+        ).fetchall()
+        return [(r[0], r[1], r[2], r[3], json.loads(r[4]), r[5]) for r in rows]
+
+    def mean_rank_by_year(self, team):
+        """Mean rank of a team for each year across all stored runs."""
+        self.flush()
+        return self.conn.execute(
+            "SELECT year, AVG(rank), COUNT(*) FROM standings "
+            "WHERE team = ? GROUP BY year ORDER BY year",
+            (team,)
+        ).fetchall()
+
+    def load_learning_stats(self, run_id):
+        """Rebuild a SarsaAgent-style learning_stats dict for a stored run."""
+        self.flush()
+        stats = {'years': [], 'scores': [], 'budgets': {}, 'rosters': {}}
+        rows = self.conn.execute(
+            "SELECT year, team, score, budget, roster_size FROM standings "
+            "WHERE run_id = ? ORDER BY year, rank",
+            (run_id,)
+        ).fetchall()
+        for year, team, score, budget, roster_size in rows:
+            if not stats['years'] or stats['years'][-1] != year:
+                stats['years'].append(year)
+                stats['scores'].append({})
+            stats['scores'][-1][team] = score
+            stats['budgets'].setdefault(team, []).append(budget)
+            stats['rosters'].setdefault(team, []).append(roster_size)
+        return stats
+
+    def close(self):
+        """Flush pending writes and close the connection."""
+        self.flush()
+        self.conn.close()